@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models import Q
 
 from .models import Claim, ClaimDetail, Note
 
@@ -15,9 +16,12 @@ class ClaimAdmin(admin.ModelAdmin):
         "billed_amount",
         "paid_amount",
         "is_flagged",
+        "flagged_by",
         "discharge_date",
+        "last_note_at",
         "updated_at",
     )
+    list_select_related = ("flagged_by",)
     list_filter = ("status", "is_flagged", "insurer_name")
     search_fields = ("patient_name", "insurer_name")
     ordering = ("-discharge_date",)
@@ -28,6 +32,7 @@ class ClaimDetailAdmin(admin.ModelAdmin):
     """Admin configuration for the ClaimDetail model."""
 
     list_display = ("claim", "cpt_codes")
+    list_select_related = ("claim",)
     search_fields = ("claim__patient_name",)
 
 
@@ -36,5 +41,18 @@ class NoteAdmin(admin.ModelAdmin):
     """Admin configuration for the Note model."""
 
     list_display = ("claim", "user", "created_at")
+    list_select_related = ("claim", "user")
     search_fields = ("claim__patient_name", "user__username")
     autocomplete_fields = ("claim", "user")
+
+    def save_model(self, request, obj, form, change):
+        """
+        Saves the note and, for a new note, records it as the claim's latest unless
+        the claim already has a newer one; created_at is editable, so it may be back-dated.
+        """
+        super().save_model(request, obj, form, change)
+        if not change:
+            Claim.objects.filter(
+                Q(id=obj.claim_id),
+                Q(last_note_at__isnull=True) | Q(last_note_at__lt=obj.created_at),
+            ).update(last_note_at=obj.created_at)
@@ -3,7 +3,7 @@ from pathlib import Path
 
 from django.core.management.base import (BaseCommand, CommandError, CommandParser)
 
-from claims.services import ClaimDataIngestor
+from claims.services import DEFAULT_BATCH_SIZE, ClaimDataIngestor
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +43,20 @@ class Command(BaseCommand):
                 "Defaults to 'append'."
             ),
         )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f"Number of rows written per bulk INSERT. Defaults to {DEFAULT_BATCH_SIZE}.",
+        )
+        parser.add_argument(
+            "--atomic",
+            action="store_true",
+            help=(
+                "Load everything in a single transaction so any failure rolls back the whole load. "
+                "By default each batch commits on its own."
+            ),
+        )
 
     def handle(self, *args, **options) -> None:
         """The main execution logic for the command."""
@@ -50,18 +64,27 @@ class Command(BaseCommand):
         details_csv_path: Path = options["details_csv"]
         delimiter: str = options["delimiter"]
         mode: str = options["mode"]
+        atomic: bool = options["atomic"]
+        batch_size: int = options["batch_size"]
 
         if not claims_csv_path.exists():
             raise CommandError(f"File not found at: {claims_csv_path}")
         if not details_csv_path.exists():
             raise CommandError(f"File not found at: {details_csv_path}")
+        if batch_size < 1:
+            raise CommandError("--batch-size must be a positive integer.")
 
         logger.info(
             f"Starting data ingestion with delimiter='{delimiter}', mode='{mode}'..."
         )
 
         ingestor = ClaimDataIngestor(
-            claims_csv_path, details_csv_path, delimiter=delimiter, mode=mode
+            claims_csv_path,
+            details_csv_path,
+            delimiter=delimiter,
+            mode=mode,
+            batch_size=batch_size,
+            atomic=atomic,
         )
 
         try:
@@ -77,6 +100,10 @@ class Command(BaseCommand):
         logger.info("-------------------------")
 
         # Report errors
+        if ingestor.errors_truncated:
+            logger.warning(
+                f"{ingestor.errors_truncated} further row errors were logged but not kept in the summary."
+            )
         if errors:
             logger.warning("Data ingestion completed with some errors.")
         else:
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:00
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0005_alter_claim_billed_amount_alter_claim_flagged_at_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["status", "-discharge_date"], name="claim_status_disch_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["is_flagged", "-updated_at"], name="claim_flagged_updated_idx"
+            ),
+        ),
+    ]
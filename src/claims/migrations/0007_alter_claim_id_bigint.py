@@ -0,0 +1,20 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0006_claim_status_flagged_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="claim",
+            name="id",
+            field=models.BigIntegerField(
+                editable=False, primary_key=True, serialize=False
+            ),
+        ),
+    ]
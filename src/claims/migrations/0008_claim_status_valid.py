@@ -0,0 +1,46 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:09
+
+from django.db import migrations, models
+
+VALID_STATUSES = ("PAID", "DENIED", "UNDER REVIEW")
+
+
+def normalize_statuses(apps, schema_editor):
+    """
+    Rewrites stored status spellings (e.g. 'under_review', 'Paid ') to their canonical
+    values so the CHECK constraint can be added. Earlier loads accepted any upper-cased
+    status, so values that match no known status stop the migration with a report
+    rather than being guessed at.
+    """
+    Claim = apps.get_model("claims", "Claim")
+    unknown = {}
+    for status in Claim.objects.values_list("status", flat=True).distinct():
+        canonical = " ".join(status.replace("_", " ").replace("-", " ").split()).upper()
+        if canonical not in VALID_STATUSES:
+            unknown[status] = Claim.objects.filter(status=status).count()
+        elif canonical != status:
+            Claim.objects.filter(status=status).update(status=canonical)
+    if unknown:
+        found = ", ".join(f"{status!r} ({count} claims)" for status, count in sorted(unknown.items()))
+        raise RuntimeError(
+            f"Cannot add claim_status_valid: unknown claim statuses {found}. "
+            f"Change them to one of {', '.join(VALID_STATUSES)} and re-run migrate."
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0007_alter_claim_id_bigint"),
+    ]
+
+    operations = [
+        migrations.RunPython(normalize_statuses, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="claim",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("status__in", VALID_STATUSES)),
+                name="claim_status_valid",
+            ),
+        ),
+    ]
@@ -0,0 +1,42 @@
+from django.db import migrations
+
+# Django compiles `icontains` on PostgreSQL to UPPER("col"::text) LIKE UPPER(%s), so the
+# trigram indexes are built on that exact expression; an index on the bare column would
+# never be chosen for the dashboard search.
+TRIGRAM_INDEXES = {
+    "claim_patient_name_trgm": "patient_name",
+    "claim_insurer_name_trgm": "insurer_name",
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """Creates the pg_trgm search indexes. Other backends have no equivalent, so skip."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    table = quote(apps.get_model("claims", "Claim")._meta.db_table)
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote(name)} ON {table} "
+            f"USING gin ((UPPER({quote(column)}::text)) gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    """Drops the pg_trgm search indexes, leaving the extension installed."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0008_claim_status_valid"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0009_claim_name_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="claim",
+            name="billed_amount",
+            field=models.DecimalField(
+                db_index=True,
+                decimal_places=2,
+                help_text="The amount originally billed to the insurer.",
+                max_digits=10,
+            ),
+        ),
+        migrations.AlterField(
+            model_name="claim",
+            name="discharge_date",
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name="claim",
+            name="paid_amount",
+            field=models.DecimalField(
+                db_index=True,
+                decimal_places=2,
+                help_text="The amount paid by the insurer.",
+                max_digits=10,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["is_flagged", "-discharge_date"], name="claim_flagged_disch_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0010_claim_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="claim",
+            name="discharge_date",
+            field=models.DateField(),
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["-discharge_date", "-id"], name="claim_disch_id_idx"
+            ),
+        ),
+    ]
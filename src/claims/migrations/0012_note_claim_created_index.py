@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:19
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0011_claim_disch_id_index"),
+    ]
+
+    operations = [
+        # Build the composite index before dropping the foreign key's own index.
+        migrations.AddIndex(
+            model_name="note",
+            index=models.Index(
+                fields=["claim", "-created_at"], name="note_claim_created_idx"
+            ),
+        ),
+        migrations.AlterField(
+            model_name="note",
+            name="claim",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="notes",
+                to="claims.claim",
+            ),
+        ),
+    ]
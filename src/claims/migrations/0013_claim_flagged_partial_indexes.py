@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0012_note_claim_created_index"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="claim",
+            name="claim_flagged_updated_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="claim",
+            name="claim_flagged_disch_idx",
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                condition=models.Q(("is_flagged", True)),
+                fields=["-discharge_date", "-id"],
+                name="claim_flagged_disch_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                condition=models.Q(("is_flagged", True)),
+                fields=["-updated_at"],
+                name="claim_flagged_updated_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:24
+
+from django.db import migrations, models
+
+
+def backfill_last_note_at(apps, schema_editor):
+    """Sets last_note_at from each claim's newest existing note."""
+    Claim = apps.get_model("claims", "Claim")
+    Note = apps.get_model("claims", "Note")
+    notes = Note.objects.filter(claim=models.OuterRef("pk"))
+    Claim.objects.filter(models.Exists(notes)).update(
+        last_note_at=models.Subquery(
+            notes.order_by("-created_at").values("created_at")[:1]
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0013_claim_flagged_partial_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="claim",
+            name="last_note_at",
+            field=models.DateTimeField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="When the most recent note was added to this claim.",
+                null=True,
+            ),
+        ),
+        migrations.RunPython(backfill_last_note_at, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.6 on 2026-10-15 22:25
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0014_claim_last_note_at"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.functions.text.Lower("patient_name"),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="claim_pname_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.functions.text.Lower("insurer_name"),
+                    descending=True,
+                ),
+                models.OrderBy(models.F("id"), descending=True),
+                name="claim_iname_lower_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="claim",
+            name="patient_name",
+            field=models.CharField(help_text="Full name of the patient.", max_length=255),
+        ),
+    ]
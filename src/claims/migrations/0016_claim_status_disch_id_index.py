@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-15 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("claims", "0015_claim_name_lower_indexes"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="claim",
+            name="claim_status_disch_idx",
+        ),
+        migrations.AddIndex(
+            model_name="claim",
+            index=models.Index(
+                fields=["status", "-discharge_date", "-id"], name="claim_status_disch_idx"
+            ),
+        ),
+    ]
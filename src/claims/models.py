@@ -2,6 +2,7 @@ from decimal import Decimal
 
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models.functions import Lower
 from django.utils import timezone
 
 
@@ -17,17 +18,21 @@ class Claim(models.Model):
         DENIED = "DENIED", "Denied"
         UNDER_REVIEW = "UNDER REVIEW", "Under Review"
 
-    id = models.IntegerField(primary_key=True, editable=False)
-    patient_name = models.CharField(
-        max_length=255, db_index=True, help_text="Full name of the patient."
-    )
+    id = models.BigIntegerField(primary_key=True, editable=False)
+    # No plain index: the name sort uses claim_pname_lower_idx, and the icontains
+    # search cannot use a B-tree, so one would only slow down writes.
+    patient_name = models.CharField(max_length=255, help_text="Full name of the patient.")
     billed_amount = models.DecimalField(
         max_digits=10,
         decimal_places=2,
+        db_index=True,
         help_text="The amount originally billed to the insurer.",
     )
     paid_amount = models.DecimalField(
-        max_digits=10, decimal_places=2, help_text="The amount paid by the insurer."
+        max_digits=10,
+        decimal_places=2,
+        db_index=True,
+        help_text="The amount paid by the insurer.",
     )
     status = models.CharField(
         max_length=20,
@@ -56,10 +61,58 @@ class Claim(models.Model):
         null=True, blank=True, help_text="The timestamp when the claim was flagged."
     )
 
+    # Denormalized from Note so lists can show or sort by note activity without a GROUP BY.
+    last_note_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        help_text="When the most recent note was added to this claim.",
+    )
+
     # Timestamps for record creation and updates.
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        constraints = [
+            # Mirrors ClaimStatus, which is not in scope inside Meta.
+            models.CheckConstraint(
+                condition=models.Q(status__in=["PAID", "DENIED", "UNDER REVIEW"]),
+                name="claim_status_valid",
+            ),
+        ]
+        indexes = [
+            # Serves the status filter together with the default newest-discharge-first ordering,
+            # with id as the tie-breaker infinite scroll pages on.
+            models.Index(
+                fields=["status", "-discharge_date", "-id"], name="claim_status_disch_idx"
+            ),
+            # Serves the discharge date sort, with id as the tie-breaker infinite scroll pages on.
+            models.Index(fields=["-discharge_date", "-id"], name="claim_disch_id_idx"),
+            # Serve the case-insensitive name sorts, id breaking ties as in the list view.
+            models.Index(
+                Lower("patient_name").desc(), models.F("id").desc(), name="claim_pname_lower_idx"
+            ),
+            models.Index(
+                Lower("insurer_name").desc(), models.F("id").desc(), name="claim_iname_lower_idx"
+            ),
+            # Flagged claims are a small minority, so the flagged-only indexes are partial:
+            # they hold just those rows and answer is_flagged=true without a recheck.
+            # This one serves the flagged filter with the default discharge date ordering.
+            models.Index(
+                fields=["-discharge_date", "-id"],
+                condition=models.Q(is_flagged=True),
+                name="claim_flagged_disch_idx",
+            ),
+            # Serves the flag-review workflow: flagged claims, most recently touched first.
+            models.Index(
+                fields=["-updated_at"],
+                condition=models.Q(is_flagged=True),
+                name="claim_flagged_updated_idx",
+            ),
+        ]
+
     def __str__(self) -> str:
         """String representation of the Claim model."""
         return f"Claim {self.id} for {self.patient_name}"
@@ -94,7 +147,7 @@ class ClaimDetail(models.Model):
 
     def __str__(self) -> str:
         """String representation of the ClaimDetail model."""
-        return f"Details for Claim {self.claim.id}"
+        return f"Details for Claim {self.claim_id}"
 
 
 class Note(models.Model):
@@ -102,7 +155,10 @@ class Note(models.Model):
     Stores user-generated annotations or notes for a specific claim.
     """
 
-    claim = models.ForeignKey(Claim, on_delete=models.CASCADE, related_name="notes")
+    # No standalone index: note_claim_created_idx leads with claim and serves its lookups.
+    claim = models.ForeignKey(
+        Claim, on_delete=models.CASCADE, related_name="notes", db_index=False
+    )
     note = models.TextField(help_text="The content of the note.")
     created_at = models.DateTimeField(default=timezone.now)
     user = models.ForeignKey(
@@ -112,12 +168,17 @@ class Note(models.Model):
         help_text="The user who created this note.",
     )
 
+    class Meta:
+        indexes = [
+            # Serves a claim's notes newest first, as the detail view lists them.
+            models.Index(fields=["claim", "-created_at"], name="note_claim_created_idx"),
+        ]
+
     def __str__(self) -> str:
         """
         Provides a truncated preview of the note for display in the admin
         or other contexts.
         """
-        note_preview: str = (
-            (self.note[:75] + "...") if len(self.note) > 75 else self.note
-        )
-        return f"Note on {self.claim.id} at {self.created_at.strftime('%Y-%m-%d')}: {note_preview}"
+        # Uses the raw claim_id column so rendering a list of notes does not fetch each Claim.
+        note_preview: str = (self.note[:75] + "...") if self.note[75:76] else self.note
+        return f"Note on {self.claim_id} at {self.created_at.date().isoformat()}: {note_preview}"
@@ -1,19 +1,256 @@
 import csv
+import io
 import logging
-from datetime import datetime
+import queue
+import sys
+import threading
+from contextlib import contextmanager, nullcontext
+from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from itertools import islice
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Tuple, Union
+from typing import (
+    Any,
+    Dict,
+    Generator,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
 
-from django.db import transaction, IntegrityError
+from django.db import connection, models, transaction
+from django.db.models.constants import OnConflict
+from django.utils import timezone
 
-from .models import Claim, ClaimDetail
+from .models import Claim, ClaimDetail, Note
 
 logger = logging.getLogger(__name__)
 
 # A type alias for our summary dictionary
 LoadSummary = Dict[str, int]
 
+T = TypeVar("T")
+
+
+class ParsedClaim(NamedTuple):
+    """A validated claims CSV row, ready to become a Claim."""
+
+    id: int
+    patient_name: str
+    billed_amount: Decimal
+    paid_amount: Decimal
+    status: str
+    insurer_name: str
+    discharge_date: date
+
+# Number of rows sent to the database per multi-row INSERT.
+DEFAULT_BATCH_SIZE = 5000
+
+# Common spellings of each status mapped to its canonical value, so most rows
+# resolve with one dict lookup instead of allocating an upper-cased copy.
+STATUS_LOOKUP = {
+    spelling: value
+    for value in Claim.ClaimStatus.values
+    for spelling in (value, value.lower(), value.title())
+}
+
+# Temporary table append-mode COPY loads stage rows in before merging them (PostgreSQL).
+CLAIM_STAGING_TABLE = "claims_claim_staging"
+
+# Row-level error messages kept for the summary; later errors are only counted.
+MAX_STORED_ERRORS = 1000
+
+# Limits of the amount columns; billed_amount and paid_amount share the same precision.
+AMOUNT_DECIMAL_PLACES = Claim._meta.get_field("billed_amount").decimal_places
+AMOUNT_INTEGER_DIGITS = (
+    Claim._meta.get_field("billed_amount").max_digits - AMOUNT_DECIMAL_PLACES
+)
+
+# Read buffer for the CSV files; large sequential reads mean fewer read() syscalls.
+READ_BUFFER_SIZE = 1 << 20
+
+# Parsed batches a CSV reader thread may buffer ahead of the database writer.
+PIPELINE_DEPTH = 4
+
+# Columns refreshed when an overwrite load upserts a claim that already exists.
+CLAIM_UPDATE_FIELDS = [
+    "patient_name",
+    "billed_amount",
+    "paid_amount",
+    "status",
+    "insurer_name",
+    "discharge_date",
+    "updated_at",
+]
+DETAIL_UPDATE_FIELDS = ["cpt_codes", "denial_reason"]
+
+# Columns read from each CSV file, in the order the parsers unpack them.
+CLAIM_COLUMNS = (
+    "id",
+    "patient_name",
+    "billed_amount",
+    "paid_amount",
+    "status",
+    "insurer_name",
+    "discharge_date",
+)
+DETAIL_COLUMNS = ("claim_id", "cpt_codes")
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value: str) -> date:
+    """
+    Parses a YYYY-MM-DD date, taking the C-level ISO fast path first. Discharge
+    dates repeat heavily across a file, so parsed values are memoised.
+    """
+    # fromisoformat also accepts 20250901 and week dates such as 2025-W36-1, so
+    # only values already shaped like YYYY-MM-DD take the fast path.
+    if len(value) == 10 and value[4] == value[7] == "-":
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            pass
+    # strptime accepts non-padded values like 2025-9-1 and keeps its familiar error message.
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def _parse_amount(value: str) -> Decimal:
+    """
+    Parses a monetary amount. Decimal's C implementation already parses a string
+    faster than splitting it into integer cents, so the value is used as-is. NaN,
+    Infinity and values that do not fit the amount columns are rejected here so
+    they cannot fail a whole bulk INSERT later.
+    """
+    amount = Decimal(value)
+    if not amount.is_finite():
+        raise ValueError(f"Invalid amount: {value!r}")
+    # Normalised, so trailing zeros such as 12.50 do not count against the limits.
+    _, digits, exponent = amount.normalize().as_tuple()
+    if -exponent > AMOUNT_DECIMAL_PLACES or len(digits) + exponent > AMOUNT_INTEGER_DIGITS:
+        raise ValueError(
+            f"Invalid amount: {value!r} (at most {AMOUNT_INTEGER_DIGITS} digits before "
+            f"and {AMOUNT_DECIMAL_PLACES} after the decimal point)"
+        )
+    return amount
+
+
+def _batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """
+    Groups a lazy iterable into lists of at most `size` items. Only one batch is
+    materialised at a time, so memory is bounded by the batch, not the file.
+    """
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+def _upsert(
+    model: Type[models.Model],
+    objs: List[models.Model],
+    batch_size: int,
+    unique_fields: Sequence[str],
+    update_fields: Sequence[str],
+) -> None:
+    """
+    Equivalent of bulk_create(update_conflicts=True) without the RETURNING clause.
+
+    bulk_create() asks the database to send back every upserted row's primary key
+    so it can set it on the instances; the loader never reads them. This calls the
+    private QuerySet._insert() that bulk_create() itself uses, so revisit it when
+    upgrading Django.
+    """
+    if not objs:
+        return
+    opts = model._meta
+    fields = [f for f in opts.concrete_fields if not f.generated]
+    if objs[0].pk is None:
+        fields = [f for f in fields if not isinstance(f, models.AutoField)]
+    unique = [opts.get_field(name) for name in unique_fields]
+    update = [opts.get_field(name) for name in update_fields]
+    batch_size = min(batch_size, max(connection.ops.bulk_batch_size(fields, objs), 1))
+    queryset = model._base_manager.using(connection.alias)
+    for chunk in _batched(objs, batch_size):
+        queryset._insert(
+            chunk,
+            fields=fields,
+            on_conflict=OnConflict.UPDATE,
+            update_fields=update,
+            unique_fields=unique,
+        )
+
+
+class _BackgroundBatches:
+    """
+    Drains a batch generator on a worker thread so CSV parsing overlaps database
+    writes. A bounded queue caps how far the reader can run ahead, and anything
+    the reader raises is re-raised in the consuming thread. The worker must not
+    touch the ORM: Django connections are per-thread and outside the caller's
+    transaction.
+    """
+
+    _END = object()
+
+    def __init__(
+        self, batches: Generator[List[Any], None, None], depth: int = PIPELINE_DEPTH
+    ):
+        self._batches = batches
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=depth)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._produce, daemon=True)
+        self._thread.start()
+
+    def _put(self, item: Any) -> bool:
+        """Blocks until the item is queued; returns False if the consumer has gone away."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produce(self) -> None:
+        try:
+            for batch in self._batches:
+                if not self._put(batch):
+                    return
+        except BaseException as e:
+            self._put(e)
+        else:
+            self._put(self._END)
+        finally:
+            self._batches.close()
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        while True:
+            item = self._queue.get()
+            if item is self._END:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def __enter__(self) -> "_BackgroundBatches":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
 
 class ClaimDataIngestor:
     """
@@ -28,6 +265,8 @@ class ClaimDataIngestor:
         details_csv_path: Union[Path, str],
         delimiter: str = ",",
         mode: str = "append",
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        atomic: bool = False,
     ):
         """
         Initializes the ingestor with paths to the data files.
@@ -36,11 +275,16 @@ class ClaimDataIngestor:
             claims_csv_path: The file path for the main claims data.
             details_csv_path: The file path for the claim details data.
             delimiter: The character used to separate values in the CSV files.
+            mode: 'append' skips existing claims; 'overwrite' purges then reloads.
+            batch_size: The number of rows written per bulk INSERT.
+            atomic: Run the whole load in one transaction instead of one per batch.
         """
         self.claims_csv_path = Path(claims_csv_path)
         self.details_csv_path = Path(details_csv_path)
         self.delimiter = delimiter
         self.mode = mode  # 'append' (default) or 'overwrite'
+        self.batch_size = batch_size
+        self.atomic = atomic
         self.claims_created = 0
         self.claims_updated = 0
         self.claims_skipped = 0
@@ -48,28 +292,43 @@ class ClaimDataIngestor:
         self.details_updated = 0
         self.details_skipped = 0
         self.errors: List[str] = []
+        self.errors_truncated = 0
+        self._errors_lock = threading.Lock()
+        # IDs of every claim this run wrote or found, so details can be matched without a query.
+        self._loaded_claim_ids: Set[int] = set()
 
     def _log_error(self, row_num: int, file_name: str, error_msg: str) -> None:
-        """Helper method to format and store an error message."""
-        full_error_msg = f"Error in {file_name} at row {row_num}: {error_msg}"
-        logger.error(full_error_msg)  # Log as an ERROR
-        self.errors.append(full_error_msg)  # Keep for the command's summary
+        """
+        Helper method to log and store an error message. Only the first
+        MAX_STORED_ERRORS messages are kept; the rest are counted.
+        """
+        if logger.isEnabledFor(logging.ERROR):
+            logger.error("Error in %s at row %d: %s", file_name, row_num, error_msg)
+        self._store_error(f"Error in {file_name} at row {row_num}: {error_msg}")
+
+    def _store_error(self, message: str) -> None:
+        """Adds a message to the summary errors, or counts it once the cap is reached."""
+        # Both CSV reader threads report errors, so keep the cap check and counter consistent.
+        with self._errors_lock:
+            if len(self.errors) < MAX_STORED_ERRORS:
+                self.errors.append(message)
+            else:
+                self.errors_truncated += 1
 
-    @transaction.atomic
     def run(self) -> Tuple[LoadSummary, List[str]]:
         """
-        Executes the full data loading process within a single database transaction.
-        If any part of the process fails, the transaction is rolled back.
+        Executes the full data loading process. Each batch commits in its own
+        transaction, so row locks and WAL are released as the load progresses and
+        a failure keeps the batches already written (row-level errors are reported
+        either way). With `atomic=True` the whole load, including the overwrite
+        purge, runs in a single transaction and is rolled back as a unit.
 
         Returns:
             A tuple containing a summary dictionary of the load results and a
             list of any errors encountered.
         """
-        if self.mode == "overwrite":
-            self._purge_existing_data()
-
-        self._load_claims()
-        self._load_claim_details()
+        with transaction.atomic() if self.atomic else nullcontext():
+            self._run()
 
         summary: LoadSummary = {
             "claims_created": self.claims_created,
@@ -81,105 +340,410 @@ class ClaimDataIngestor:
         }
         return summary, self.errors
 
+    def _run(self) -> None:
+        """Purges (in overwrite mode) and loads both files."""
+        if self.mode == "overwrite":
+            self._purge_existing_data()
+
+        # Both files are parsed on worker threads while this thread writes to the database.
+        with self._deferred_claim_indexes(), _BackgroundBatches(
+            _batched(self._iter_claims(), self.batch_size)
+        ) as claim_batches, _BackgroundBatches(
+            _batched(self._iter_details(), self.batch_size)
+        ) as detail_batches:
+            self._load_claims(claim_batches)
+            self._load_claim_details(detail_batches)
+
+    @contextmanager
+    def _deferred_claim_indexes(self) -> Iterator[None]:
+        """
+        On PostgreSQL atomic overwrite loads, drops the Claim table's secondary indexes
+        for the duration of the load and rebuilds them afterwards. One sorted index
+        build is much cheaper than a B-tree insert per row into an emptied table.
+        Constraint backed indexes (primary key, unique) are kept because the upserts
+        rely on them.
+
+        Only atomic loads defer: there the DROP and CREATE run inside the load's
+        transaction, so a failed or killed load rolls back to the original indexes.
+        Per-batch loads would autocommit the DROP and leave the table unindexed if
+        the process died before the rebuild, so they keep the indexes in place.
+        """
+        if (
+            self.mode != "overwrite"
+            or not self.atomic
+            or connection.vendor != "postgresql"
+        ):
+            yield
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT i.indexname, i.indexdef FROM pg_indexes i
+                WHERE i.schemaname = current_schema() AND i.tablename = %s
+                AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conname = i.indexname)
+                """,
+                [Claim._meta.db_table],
+            )
+            indexes = cursor.fetchall()
+            for name, _ in indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(name)}")
+        logger.info(f"Overwrite mode: deferred {len(indexes)} Claim index(es) until load completes.")
+
+        # No finally: if the load raises, the rollback restores the dropped indexes.
+        yield
+        with connection.cursor() as cursor:
+            for _, definition in indexes:
+                cursor.execute(definition)
+
+    @contextmanager
+    def _batch_transaction(self) -> Iterator[None]:
+        """
+        Opens the transaction one batch is written in. On PostgreSQL the commit
+        does not wait for its WAL flush (synchronous_commit=off): a crash can lose
+        the last few acknowledged batches, which a re-run of the load restores, but
+        no batch is ever left half-applied. work_mem is raised for the ON CONFLICT
+        and IN-list work. Both settings are LOCAL and end with the transaction.
+        """
+        with transaction.atomic():
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("SET LOCAL synchronous_commit = OFF")
+                    cursor.execute("SET LOCAL work_mem = '64MB'")
+            yield
+
     def _purge_existing_data(self) -> None:
-        """Deletes all existing claim-related data prior to overwrite reload."""
-        logger.info("Overwrite mode: purging existing Claim data (cascade deletes details/notes)...")
-        # Deleting Claims will cascade to ClaimDetail and Note via FK/OneToOne settings
-        Claim.objects.all().delete()
-
-    def _parse_claim_row(self, row: Dict[str, str]) -> Dict[str, Any]:
-        """Parses and validates a single row from the claims CSV file."""
-        claim_id = int(row["id"])
-        billed_amount = Decimal(row["billed_amount"])
-        paid_amount = Decimal(row["paid_amount"])
-        discharge_date = datetime.strptime(row["discharge_date"], "%Y-%m-%d").date()
-
-        return {
-            "id": claim_id,
-            "patient_name": row["patient_name"],
-            "billed_amount": billed_amount,
-            "paid_amount": paid_amount,
-            "status": row["status"].upper(),
-            "insurer_name": row["insurer_name"],
-            "discharge_date": discharge_date,
-        }
+        """
+        Deletes all existing claim-related data prior to overwrite reload.
 
-    def _write_claim(self, claim_data: Dict[str, Any]) -> None:
-        """Create a Claim according to mode semantics."""
-        claim_id = claim_data.pop("id")
-        if self.mode == "append":
-            if Claim.objects.filter(id=claim_id).exists():
+        The ORM's delete collector is bypassed, so no delete signals fire for the
+        purged claims, details, or notes.
+        """
+        logger.info("Overwrite mode: purging existing Claim data, details and notes...")
+        # Children first, so foreign keys hold at every step on backends that enforce them.
+        purge_models = (Note, ClaimDetail, Claim)
+        if connection.vendor == "postgresql":
+            tables = ", ".join(connection.ops.quote_name(m._meta.db_table) for m in purge_models)
+            with connection.cursor() as cursor:
+                cursor.execute(f"TRUNCATE TABLE {tables} RESTART IDENTITY CASCADE")
+            return
+        for model in purge_models:
+            model.objects.all()._raw_delete(using=connection.alias)
+
+    def _open(self, path: Path) -> TextIO:
+        """
+        Opens a CSV file for reading. Kept as a method so callers (and tests) can
+        supply another text stream without patching the global open().
+        """
+        return open(
+            path, mode="r", encoding="utf-8", newline="", buffering=READ_BUFFER_SIZE
+        )
+
+    def _column_positions(
+        self, header: Optional[List[str]], columns: Sequence[str], file_name: str
+    ) -> Optional[List[int]]:
+        """
+        Maps the required column names onto their positions in the CSV header.
+        Logs a single error and returns None if any column is missing.
+        """
+        if header is None:
+            self._log_error(1, file_name, "File is empty; expected a header row.")
+            return None
+        positions = {name: i for i, name in enumerate(header)}
+        missing = [name for name in columns if name not in positions]
+        if missing:
+            self._log_error(1, file_name, f"Missing required column(s): {', '.join(missing)}")
+            return None
+        return [positions[name] for name in columns]
+
+    def _parse_claim_row(self, values: Sequence[str]) -> ParsedClaim:
+        """
+        Parses and validates a single row from the claims CSV file. `values` holds
+        the row's fields in CLAIM_COLUMNS order.
+        """
+        raw_id, patient_name, billed, paid, status, insurer_name, discharge = values
+        claim_id = int(raw_id)
+        billed_amount = _parse_amount(billed)
+        paid_amount = _parse_amount(paid)
+        normalized_status = STATUS_LOOKUP.get(status) or STATUS_LOOKUP.get(status.upper())
+        if normalized_status is None:
+            # Rejected here so the table's CHECK constraint never fails a whole batch.
+            raise ValueError(
+                f"Invalid status {status!r}; expected one of {', '.join(Claim.ClaimStatus.values)}"
+            )
+        return ParsedClaim(
+            id=claim_id,
+            patient_name=patient_name,
+            billed_amount=billed_amount,
+            paid_amount=paid_amount,
+            status=normalized_status,
+            # Few distinct insurers repeat across every row; share one string object per name.
+            insurer_name=sys.intern(insurer_name),
+            discharge_date=_parse_date(discharge),
+        )
+
+    def _flush_claims(self, pending: List[Claim]) -> None:
+        """
+        Writes a batch of parsed claims using a single multi-row INSERT.
+
+        Append mode skips claims whose IDs already exist. Overwrite mode upserts
+        on the primary key, so a repeated ID later in the file replaces the earlier row.
+        """
+        if not pending:
+            return
+
+        # Collapse repeated IDs within the batch; a multi-row upsert may not touch the same row twice.
+        batch: Dict[int, Claim] = {}
+        for claim in pending:
+            if claim.id in batch and self.mode == "append":
                 self.claims_skipped += 1
-                return
-            Claim.objects.create(id=claim_id, **claim_data)
-            self.claims_created += 1
+                continue
+            batch[claim.id] = claim
+        # Every ID in the batch exists once this flush commits, whichever branch handles it.
+        self._loaded_claim_ids.update(batch)
+
+        if self.mode == "append" and connection.vendor == "postgresql":
+            created = self._copy_claims_skipping_existing(list(batch.values()))
+            self.claims_created += created
+            self.claims_skipped += len(batch) - created
             return
-        # overwrite mode: table was purged; create fresh rows only
-        try:
-            Claim.objects.create(id=claim_id, **claim_data)
-            self.claims_created += 1
-        except IntegrityError as e:
-            # Duplicate IDs within the same CSV or DB state mismatch
-            self._log_error(0, self.claims_csv_path.name, f"Integrity error for claim {claim_id}: {e}")
-
-    def _load_claims(self) -> None:
-        """Loads the main claim records from the provided CSV file."""
-        logger.info(f"Processing the main claims file: {self.claims_csv_path.name}")
+
+        existing_ids = set(
+            Claim.objects.filter(id__in=list(batch)).values_list("id", flat=True)
+        )
+        if self.mode == "append":
+            new_claims = [c for cid, c in batch.items() if cid not in existing_ids]
+            self.claims_skipped += len(batch) - len(new_claims)
+            # The probe above only feeds the counters; the database settles any race with
+            # a concurrent writer instead of failing the whole batch.
+            Claim.objects.bulk_create(
+                new_claims, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            self.claims_created += len(new_claims)
+            return
+
+        # overwrite mode: table was purged; conflicts only arise from IDs repeated in the CSV
+        self.claims_updated += (len(pending) - len(batch)) + len(existing_ids)
+        self.claims_created += len(batch) - len(existing_ids)
+        to_upsert = list(batch.values())
+        if connection.vendor == "postgresql":
+            # Fresh rows cannot conflict, so stream them through COPY and upsert only the rest.
+            self._copy_claims([c for cid, c in batch.items() if cid not in existing_ids])
+            to_upsert = [c for cid, c in batch.items() if cid in existing_ids]
+        _upsert(
+            Claim,
+            to_upsert,
+            self.batch_size,
+            unique_fields=["id"],
+            update_fields=CLAIM_UPDATE_FIELDS,
+        )
+
+    def _copy_claims_skipping_existing(self, claims: List[Claim]) -> int:
+        """
+        Appends claims on PostgreSQL by COPYing them into a temporary staging table
+        and moving them across with INSERT ... ON CONFLICT DO NOTHING. The insert's
+        row count says how many were new, so no existence probe is needed.
+        """
+        quote = connection.ops.quote_name
+        table = quote(Claim._meta.db_table)
+        staging = quote(CLAIM_STAGING_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(f"CREATE TEMPORARY TABLE {staging} (LIKE {table} INCLUDING DEFAULTS)")
+        self._copy_claims(claims, table=CLAIM_STAGING_TABLE)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} SELECT * FROM {staging} "
+                f"ON CONFLICT ({quote(Claim._meta.pk.column)}) DO NOTHING"
+            )
+            inserted = cursor.rowcount
+            # Dropped explicitly: with --atomic the surrounding transaction spans every batch.
+            cursor.execute(f"DROP TABLE {staging}")
+        return inserted
+
+    def _copy_claims(self, claims: List[Claim], table: Optional[str] = None) -> None:
+        """
+        Streams claims into PostgreSQL with COPY FROM STDIN, bypassing INSERT
+        parameter binding entirely. When writing to the Claim table itself, only
+        valid for IDs known not to exist yet.
+        """
+        if not claims:
+            return
+        # Imported lazily: this module only resolves when a psycopg driver is installed.
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        now = timezone.now()
+        fields = Claim._meta.concrete_fields
+        quote = connection.ops.quote_name
+        sql = "COPY {} ({}) FROM STDIN".format(
+            quote(table or Claim._meta.db_table), ", ".join(quote(f.column) for f in fields)
+        )
+        rows = []
+        for claim in claims:
+            claim.created_at = claim.updated_at = now
+            rows.append([getattr(claim, f.attname) for f in fields])
+
+        with connection.cursor() as cursor:
+            if is_psycopg3:
+                with cursor.copy(sql) as copy:
+                    for row in rows:
+                        copy.write_row(row)
+            else:
+                # psycopg2 has no row writer; hand it a CSV buffer with an explicit NULL marker.
+                buffer = io.StringIO()
+                csv.writer(buffer).writerows(
+                    [r"\N" if value is None else value for value in row] for row in rows
+                )
+                buffer.seek(0)
+                cursor.copy_expert(sql + r" WITH (FORMAT CSV, NULL '\N')", buffer)
+
+    def _iter_claims(self) -> Iterator[Claim]:
+        """Lazily parses the claims CSV file, yielding unsaved Claims."""
+        file_name = self.claims_csv_path.name
+        logger.info(f"Processing the main claims file: {file_name}")
         try:
-            with open(self.claims_csv_path, mode="r", encoding="utf-8") as f:
-                reader = csv.DictReader(f, delimiter=self.delimiter)
+            with self._open(self.claims_csv_path) as f:
+                # Positional access avoids building a dict for every row.
+                reader = csv.reader(f, delimiter=self.delimiter)
+                positions = self._column_positions(
+                    next(reader, None), CLAIM_COLUMNS, file_name
+                )
+                if positions is None:
+                    return
+                # Bound once so the loop body does no attribute lookups per row.
+                pick = itemgetter(*positions)
+                parse_row = self._parse_claim_row
                 for i, row in enumerate(reader, start=2):
+                    if not row:
+                        continue
                     try:
-                        claim_data = self._parse_claim_row(row)
-                        self._write_claim(claim_data)
-                    except (ValueError, InvalidOperation, KeyError) as e:
-                        self._log_error(i, self.claims_csv_path.name, str(e))
+                        parsed = parse_row(pick(row))
+                    except (ValueError, InvalidOperation, IndexError) as e:
+                        self._log_error(i, file_name, str(e))
+                        continue
+                    yield Claim(
+                        id=parsed.id,
+                        patient_name=parsed.patient_name,
+                        billed_amount=parsed.billed_amount,
+                        paid_amount=parsed.paid_amount,
+                        status=parsed.status,
+                        insurer_name=parsed.insurer_name,
+                        discharge_date=parsed.discharge_date,
+                    )
         except FileNotFoundError:
             logger.critical(f"File not found: {self.claims_csv_path}")
-            self.errors.append(f"File not found: {self.claims_csv_path}")
+            self._store_error(f"File not found: {self.claims_csv_path}")
             raise
 
-    def _load_claim_details(self) -> None:
-        """Loads the claim detail records from the provided CSV file."""
-        logger.info(f"Processing the details file: {self.details_csv_path.name}")
+    def _load_claims(self, batches: Iterable[List[Claim]]) -> None:
+        """Writes parsed claim batches to the database."""
+        for batch in batches:
+            with self._batch_transaction():
+                self._flush_claims(batch)
+
+    def _flush_details(self, pending: List[ClaimDetail]) -> None:
+        """
+        Writes a batch of claim details using a single multi-row INSERT.
+
+        Append mode skips claims that already have a detail record. Overwrite mode
+        upserts on the one-to-one claim column.
+        """
+        if not pending:
+            return
+
+        batch: Dict[int, ClaimDetail] = {}
+        for detail in pending:
+            if detail.claim_id in batch and self.mode == "append":
+                self.details_skipped += 1
+                continue
+            batch[detail.claim_id] = detail
+
+        existing_ids = set(
+            ClaimDetail.objects.filter(claim_id__in=list(batch)).values_list(
+                "claim_id", flat=True
+            )
+        )
+        if self.mode == "append":
+            new_details = [d for cid, d in batch.items() if cid not in existing_ids]
+            self.details_skipped += len(batch) - len(new_details)
+            ClaimDetail.objects.bulk_create(
+                new_details, batch_size=self.batch_size, ignore_conflicts=True
+            )
+            self.details_created += len(new_details)
+            return
+
+        # overwrite mode: table was purged along with Claims
+        self.details_updated += (len(pending) - len(batch)) + len(existing_ids)
+        self.details_created += len(batch) - len(existing_ids)
+        _upsert(
+            ClaimDetail,
+            list(batch.values()),
+            self.batch_size,
+            unique_fields=["claim"],
+            update_fields=DETAIL_UPDATE_FIELDS,
+        )
+
+    def _iter_details(self) -> Iterator[Tuple[int, ClaimDetail]]:
+        """
+        Lazily parses the details CSV file, yielding (row number, unsaved ClaimDetail)
+        pairs. Claim existence is checked by the writer once claims are loaded.
+        """
+        file_name = self.details_csv_path.name
+        logger.info(f"Processing the details file: {file_name}")
         try:
-            with open(self.details_csv_path, mode="r", encoding="utf-8") as f:
-                reader = csv.DictReader(f, delimiter=self.delimiter)
+            with self._open(self.details_csv_path) as f:
+                reader = csv.reader(f, delimiter=self.delimiter)
+                header = next(reader, None)
+                positions = self._column_positions(header, DETAIL_COLUMNS, file_name)
+                if positions is None:
+                    return
+                claim_pos, cpt_pos = positions
+                # denial_reason is optional; a missing column loads as an empty reason.
+                denial_pos = header.index("denial_reason") if "denial_reason" in header else None
                 for i, row in enumerate(reader, start=2):
+                    if not row:
+                        continue
                     try:
-                        claim_id = int(row["claim_id"])
-                        claim = Claim.objects.get(id=claim_id)
-
-                        defaults = {
-                            "cpt_codes": row["cpt_codes"],
-                            "denial_reason": row.get("denial_reason", ""),
-                        }
-                        if self.mode == "append":
-                            if ClaimDetail.objects.filter(claim=claim).exists():
-                                self.details_skipped += 1
-                            else:
-                                ClaimDetail.objects.create(claim=claim, **defaults)
-                                self.details_created += 1
-                        else:
-                            # overwrite mode: table was purged by deleting Claims
-                            try:
-                                ClaimDetail.objects.create(claim=claim, **defaults)
-                                self.details_created += 1
-                            except IntegrityError as e:
-                                self._log_error(
-                                    i,
-                                    self.details_csv_path.name,
-                                    f"Integrity error for claim detail {claim.id}: {e}",
-                                )
-                    except Claim.DoesNotExist:
-                        self._log_error(
-                            i,
-                            self.details_csv_path.name,
-                            f"Claim with id={claim_id} not found.",
+                        detail = ClaimDetail(
+                            claim_id=int(row[claim_pos]),
+                            cpt_codes=row[cpt_pos],
+                            denial_reason=row[denial_pos] if denial_pos is not None else "",
                         )
-                    except (ValueError, KeyError) as e:
-                        self._log_error(i, self.details_csv_path.name, str(e))
+                    except (ValueError, IndexError) as e:
+                        self._log_error(i, file_name, str(e))
+                        continue
+                    yield i, detail
         except FileNotFoundError:
             logger.critical(f"File not found: {self.details_csv_path}")
-            self.errors.append(f"File not found: {self.details_csv_path}")
+            self._store_error(f"File not found: {self.details_csv_path}")
             raise
+
+    def _load_claim_details(self, batches: Iterable[List[Tuple[int, ClaimDetail]]]) -> None:
+        """
+        Writes parsed claim detail batches, skipping rows whose claim does not exist.
+
+        Claims loaded earlier in this run are matched in memory. Only append mode
+        looks the remaining IDs up, since they may belong to claims from a previous
+        load; after an overwrite purge nothing else can exist.
+        """
+        file_name = self.details_csv_path.name
+        loaded_ids = self._loaded_claim_ids
+        for batch in batches:
+            claim_ids = {detail.claim_id for _, detail in batch}
+            valid_ids = claim_ids & loaded_ids
+            unresolved = claim_ids - valid_ids
+            if unresolved and self.mode == "append":
+                valid_ids.update(
+                    Claim.objects.filter(id__in=unresolved).values_list("id", flat=True)
+                )
+            details: List[ClaimDetail] = []
+            for i, detail in batch:
+                if detail.claim_id not in valid_ids:
+                    self._log_error(
+                        i,
+                        file_name,
+                        f"Claim with id={detail.claim_id} not found.",
+                    )
+                    continue
+                details.append(detail)
+            with self._batch_transaction():
+                self._flush_details(details)
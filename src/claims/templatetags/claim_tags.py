@@ -1,8 +1,31 @@
+from urllib.parse import quote
+
 from django import template
 from django.utils.safestring import mark_safe
 
 register = template.Library()
 
+# Sort direction arrows, marked safe once at import rather than on every render.
+ASC_ARROW = mark_safe(
+    '<svg width="10" height="10" viewBox="0 0 24 24" style="vertical-align: middle;"><path d="M12 3l-12 18h24z"/></svg>'
+)
+DESC_ARROW = mark_safe(
+    '<svg width="10" height="10" viewBox="0 0 24 24" style="vertical-align: middle;"><path d="M12 21l12-18h-24z"/></svg>'
+)
+
+
+def _sort_state(request) -> tuple[str, bool]:
+    """
+    Parses the request's `sort` parameter into (field name, descending) once per
+    request; every sortable header calls both tags. A missing parameter means the
+    list view's default ascending sort on `id`.
+    """
+    state = getattr(request, "_sort_state", None)
+    if state is None:
+        current_sort = request.GET.get("sort", "id")
+        state = request._sort_state = (current_sort.lstrip("-"), current_sort.startswith("-"))
+    return state
+
 
 @register.simple_tag(takes_context=True)
 def sort_url(context, field_name: str) -> str:
@@ -21,21 +44,29 @@ def sort_url(context, field_name: str) -> str:
         e.g., "?search=acme&status=PAID&sort=-billed_amount"
     """
     request = context["request"]
-    query_params = request.GET.copy()
-
-    current_sort = query_params.get("sort", "")
+    current_field, descending = _sort_state(request)
 
-    if current_sort.lstrip("-") == field_name:
+    if current_field == field_name:
         # The current field is being sorted, so reverse the direction.
-        if current_sort.startswith("-"):
-            query_params["sort"] = field_name  # From descending to ascending.
+        if descending:
+            target = field_name  # From descending to ascending.
         else:
-            query_params["sort"] = f"-{field_name}"  # From ascending to descending.
+            target = f"-{field_name}"  # From ascending to descending.
     else:
         # It's a new field, so default to ascending.
-        query_params["sort"] = field_name
+        target = field_name
+
+    # Every sortable header shares the same non-sort parameters, so copy and
+    # encode them once per request instead of once per column.
+    base = getattr(request, "_sort_url_base", None)
+    if base is None:
+        query_params = request.GET.copy()
+        query_params.pop("sort", None)
+        base = request._sort_url_base = query_params.urlencode()
 
-    return f"?{query_params.urlencode()}"
+    if base:
+        return f"?{base}&sort={quote(target)}"
+    return f"?sort={quote(target)}"
 
 
 @register.simple_tag(takes_context=True)
@@ -51,18 +82,10 @@ def sort_indicator(context, field_name: str) -> str:
         An HTML string for an SVG arrow if the field is being sorted,
         otherwise an empty string.
     """
-    request = context["request"]
-    current_sort = request.GET.get("sort", "id")
+    current_field, descending = _sort_state(context["request"])
 
-    if current_sort.lstrip("-") == field_name:
-        if current_sort.startswith("-"):
-            # Descending Arrow
-            svg = '<svg width="10" height="10" viewBox="0 0 24 24" style="vertical-align: middle;"><path d="M12 21l12-18h-24z"/></svg>'
-            return mark_safe(svg)
-        else:
-            # Ascending Arrow
-            svg = '<svg width="10" height="10" viewBox="0 0 24 24" style="vertical-align: middle;"><path d="M12 3l-12 18h24z"/></svg>'
-            return mark_safe(svg)
+    if current_field == field_name:
+        return DESC_ARROW if descending else ASC_ARROW
     return ""
 
 
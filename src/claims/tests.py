@@ -1,12 +1,42 @@
+import io
+import tempfile
+from datetime import timedelta
 from decimal import Decimal
-from django.test import TestCase
+from unittest import mock
+from django.core.management import call_command
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.utils import timezone
 from pathlib import Path
 
 from .models import Claim, ClaimDetail, Note
 from .services import ClaimDataIngestor
-from unittest.mock import patch, mock_open
+from .templatetags.claim_tags import sort_url
+
+class InMemoryClaimDataIngestor(ClaimDataIngestor):
+    """Serves CSV content from memory through the ingestor's _open() hook."""
+
+    def __init__(self, contents, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.contents = contents
+
+    def _open(self, path):
+        return io.StringIO(self.contents[path])
+
+
+class FailingBatchIngestor(InMemoryClaimDataIngestor):
+    """Raises while writing the second claim batch, after the first has been written."""
+
+    def _flush_claims(self, pending):
+        self.flushed_batches = getattr(self, "flushed_batches", 0) + 1
+        if self.flushed_batches == 2:
+            raise RuntimeError("database went away")
+        super()._flush_claims(pending)
+
 
 class ClaimDataIngestorTests(TestCase):
     """
@@ -14,25 +44,22 @@ class ClaimDataIngestorTests(TestCase):
     """
 
     def setUp(self):
-        # Use simple strings. The mock doesn't care about the actual path,
-        # only that the key used to create the mock matches the key used to look it up.
         self.dummy_claims_path = "dummy_claims.csv"
         self.dummy_details_path = "dummy_details.csv"
 
-    def _run_ingestor_with_string_io(self, claims_csv_content: str, details_csv_content: str, *, mode: str = "append"):
+    def _run_ingestor_with_string_io(self, claims_csv_content: str, details_csv_content: str, *, mode: str = "append", **kwargs):
         """Helper to run the ingestor with in-memory CSV data and a specific mode."""
-        ingestor = ClaimDataIngestor(self.dummy_claims_path, self.dummy_details_path, mode=mode)
-
-        # The keys for the mock_files dictionary MUST be Path objects,
-        # because the service now uses Path objects internally to call open().
-        mock_files = {
-            Path(self.dummy_claims_path): mock_open(read_data=claims_csv_content).return_value,
-            Path(self.dummy_details_path): mock_open(read_data=details_csv_content).return_value,
-        }
-
-        # The 'file' argument received here will be a Path object.
-        with patch("builtins.open", lambda file, **kwargs: mock_files[file]):
-            return ingestor.run()
+        ingestor = InMemoryClaimDataIngestor(
+            {
+                Path(self.dummy_claims_path): claims_csv_content,
+                Path(self.dummy_details_path): details_csv_content,
+            },
+            self.dummy_claims_path,
+            self.dummy_details_path,
+            mode=mode,
+            **kwargs,
+        )
+        return ingestor.run()
 
     def test_successful_data_load(self):
         """Tests a clean, successful import of new data."""
@@ -87,6 +114,25 @@ class ClaimDataIngestorTests(TestCase):
         self.assertEqual(Claim.objects.get(id=claim_id).status, "PAID")
         self.assertEqual(Claim.objects.get(id=claim_id).paid_amount, Decimal("500.00"))
 
+    def test_overwrite_purges_details_and_notes(self):
+        """Overwrite mode should clear details and notes along with the claims they belong to."""
+        claim = Claim.objects.create(
+            id=5, patient_name="Old", billed_amount=Decimal("1.00"), paid_amount=Decimal("0.00"),
+            status="PAID", insurer_name="Ins", discharge_date="2025-08-01",
+        )
+        ClaimDetail.objects.create(claim=claim, cpt_codes="99213")
+        Note.objects.create(claim=claim, note="stale")
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "6,New,10.00,0.00,PAID,Ins,2025-08-01"
+        )
+
+        self._run_ingestor_with_string_io(claims_csv, "id,claim_id,cpt_codes,denial_reason\n", mode="overwrite")
+
+        self.assertEqual(list(Claim.objects.values_list("id", flat=True)), [6])
+        self.assertFalse(ClaimDetail.objects.exists())
+        self.assertFalse(Note.objects.exists())
+
     def test_append_skips_existing_data(self):
         """Append mode should not modify existing records; it skips duplicates."""
         claim_id = 2
@@ -106,6 +152,108 @@ class ClaimDataIngestorTests(TestCase):
         self.assertEqual(len(errors2), 0)
         self.assertEqual(summary2.get("claims_skipped", 0), 1)
 
+    def test_append_across_multiple_batches(self):
+        """Rows spanning several bulk batches are all loaded; repeated IDs are skipped."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,A,10.00,0.00,PAID,Ins,2025-08-01\n"
+            "2,B,20.00,0.00,paid,Ins,2025-08-02\n"
+            "2,B again,20.00,0.00,PAID,Ins,2025-08-02\n"
+            "3,C,30.00,0.00,DENIED,Ins,2025-08-03"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv, batch_size=2)
+
+        self.assertEqual(len(errors), 0)
+        self.assertEqual(summary["claims_created"], 3)
+        self.assertEqual(summary["claims_skipped"], 1)
+        self.assertEqual(Claim.objects.get(id=2).patient_name, "B")
+        self.assertEqual(Claim.objects.get(id=2).status, "PAID")
+
+    def test_detail_queries_do_not_scale_with_rows(self):
+        """Details are validated and written per batch, not per row; missing claims are reported."""
+        header = "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+
+        def load(first_id, count):
+            ids = range(first_id, first_id + count)
+            claims_csv = header + "\n".join(f"{n},P{n},10.00,0.00,PAID,Ins,2025-08-01" for n in ids)
+            # One extra detail row points at a claim that was never loaded.
+            details_csv = "id,claim_id,cpt_codes,denial_reason\n" + "\n".join(
+                f"{n},{n},99213," for n in range(first_id, first_id + count + 1)
+            )
+            with CaptureQueriesContext(connection) as queries:
+                summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+            return len(queries), summary, errors
+
+        small_queries, _, _ = load(1, 2)
+        large_queries, summary, errors = load(100, 20)
+
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(summary["details_created"], 20)
+        self.assertEqual(errors, ["Error in dummy_details.csv at row 22: Claim with id=120 not found."])
+
+    def test_append_details_match_claims_from_earlier_loads(self):
+        """In append mode, details may reference claims loaded by a previous run."""
+        header = "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+        details_header = "id,claim_id,cpt_codes,denial_reason\n"
+        self._run_ingestor_with_string_io(header + "1,A,10.00,0.00,PAID,Ins,2025-08-01", details_header)
+
+        summary, errors = self._run_ingestor_with_string_io(
+            header + "2,B,10.00,0.00,PAID,Ins,2025-08-01",
+            details_header + "1,1,99213,\n2,2,99214,",
+        )
+
+        self.assertEqual(summary["details_created"], 2)
+        self.assertEqual(errors, [])
+
+    def _run_failing_load(self, **kwargs):
+        """Loads three claims in batches of two, failing on the second batch."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,A,10.00,0.00,PAID,Ins,2025-08-01\n"
+            "2,B,20.00,0.00,PAID,Ins,2025-08-02\n"
+            "3,C,30.00,0.00,DENIED,Ins,2025-08-03"
+        )
+        ingestor = FailingBatchIngestor(
+            {
+                Path(self.dummy_claims_path): claims_csv,
+                Path(self.dummy_details_path): "id,claim_id,cpt_codes,denial_reason\n",
+            },
+            self.dummy_claims_path,
+            self.dummy_details_path,
+            batch_size=2,
+            **kwargs,
+        )
+        with self.assertRaisesMessage(RuntimeError, "database went away"):
+            ingestor.run()
+
+    def test_failed_load_keeps_batches_written_before_the_failure(self):
+        """By default each batch commits on its own, so earlier batches survive a failure."""
+        self._run_failing_load()
+
+        self.assertEqual(list(Claim.objects.order_by("id").values_list("id", flat=True)), [1, 2])
+
+    def test_atomic_failed_load_rolls_back_purge_and_batches(self):
+        """With atomic=True a failure undoes the overwrite purge and every batch written."""
+        Claim.objects.create(
+            id=9, patient_name="Old", billed_amount=Decimal("1.00"), paid_amount=Decimal("0.00"),
+            status="PAID", insurer_name="Ins", discharge_date="2025-07-01",
+        )
+
+        self._run_failing_load(mode="overwrite", atomic=True)
+
+        self.assertEqual(list(Claim.objects.values_list("id", flat=True)), [9])
+
+    def test_missing_file_raises_from_reader_thread(self):
+        """A file error in a background CSV reader surfaces in the caller and in the error list."""
+        dummy_claims = Path(__file__).resolve().parent.parent / "data" / "dummy" / "dummy_claims.csv"
+        ingestor = ClaimDataIngestor(dummy_claims, "missing_details.csv", delimiter="|")
+
+        with self.assertRaises(FileNotFoundError):
+            ingestor.run()
+        self.assertIn("File not found: missing_details.csv", ingestor.errors)
+
     def test_handles_bad_data_gracefully(self):
         """Tests that rows with errors are skipped and reported."""
         claim_id = 1
@@ -123,6 +271,173 @@ class ClaimDataIngestorTests(TestCase):
         self.assertEqual(len(errors), 1)
         self.assertIn("invalid literal for int() with base 10: 'bad-id'", errors[0])
 
+    def test_missing_header_column_is_reported(self):
+        """A header without a required column is reported once and nothing is loaded."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,discharge_date\n"
+            "1,Kiryu Kazuma,100.00,50.00,PAID,2025-09-02"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+
+        self.assertEqual(summary["claims_created"], 0)
+        self.assertEqual(
+            errors, ["Error in dummy_claims.csv at row 1: Missing required column(s): insurer_name"]
+        )
+
+    def test_truncated_row_is_reported(self):
+        """A row with fewer fields than the header is skipped and reported."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,Kiryu Kazuma,100.00,50.00,PAID,CVS,2025-09-02\n"
+            "2,Majima Goro,100.00"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+
+        self.assertEqual(summary["claims_created"], 1)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("dummy_claims.csv at row 3", errors[0])
+
+    def test_rejects_non_iso_calendar_dates(self):
+        """Only YYYY-MM-DD dates load; compact and ISO week dates are reported."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,Kiryu Kazuma,100.00,50.00,PAID,CVS,2025-9-2\n"
+            "2,Majima Goro,100.00,50.00,PAID,CVS,20250901\n"
+            "3,Saejima Taiga,100.00,50.00,PAID,CVS,2025-W36-1"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+
+        self.assertEqual(summary["claims_created"], 1)
+        self.assertEqual(str(Claim.objects.get(id=1).discharge_date), "2025-09-02")
+        self.assertEqual(len(errors), 2)
+        self.assertIn("'20250901' does not match format '%Y-%m-%d'", errors[0])
+        self.assertIn("'2025-W36-1' does not match format '%Y-%m-%d'", errors[1])
+
+    def test_rejects_amounts_the_columns_cannot_hold(self):
+        """NaN, Infinity and amounts beyond the column precision are reported, not inserted."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,Kiryu Kazuma,99999999.990,12.50,PAID,CVS,2025-09-02\n"
+            "2,Majima Goro,NaN,0.00,PAID,CVS,2025-09-02\n"
+            "3,Saejima Taiga,100.00,Infinity,PAID,CVS,2025-09-02\n"
+            "4,Akiyama Shun,123456789012,0.00,PAID,CVS,2025-09-02\n"
+            "5,Tanimura Masayoshi,1.234,0.00,PAID,CVS,2025-09-02"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+
+        self.assertEqual(summary["claims_created"], 1)
+        self.assertEqual(Claim.objects.get().billed_amount, Decimal("99999999.99"))
+        self.assertEqual(len(errors), 4)
+        for row, value in zip(range(3, 7), ("NaN", "Infinity", "123456789012", "1.234")):
+            self.assertIn(f"at row {row}: Invalid amount: '{value}'", errors[row - 3])
+
+    def _bad_rows_csv(self, count):
+        """Claims CSV with one good row followed by `count` rows with an invalid id."""
+        return (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,Kiryu Kazuma,100.00,50.00,PAID,CVS,2025-09-02\n"
+            + "\n".join(f"bad-{n},Majima Goro,1.00,0.00,PAID,CVS,2025-09-02" for n in range(count))
+        )
+
+    @mock.patch("claims.services.MAX_STORED_ERRORS", 3)
+    def test_stored_errors_are_capped_and_the_rest_counted(self):
+        """Only the first MAX_STORED_ERRORS row errors are kept; the rest are counted."""
+        ingestor = InMemoryClaimDataIngestor(
+            {
+                Path(self.dummy_claims_path): self._bad_rows_csv(5),
+                Path(self.dummy_details_path): "id,claim_id,cpt_codes,denial_reason\n",
+            },
+            self.dummy_claims_path,
+            self.dummy_details_path,
+        )
+
+        summary, errors = ingestor.run()
+
+        self.assertEqual(summary["claims_created"], 1)
+        self.assertEqual(len(errors), 3)
+        self.assertIn("at row 3:", errors[0])
+        self.assertEqual(ingestor.errors_truncated, 2)
+
+    @mock.patch("claims.services.MAX_STORED_ERRORS", 3)
+    def test_load_command_warns_about_uncounted_errors(self):
+        """The load command reports how many row errors were left out of the summary."""
+        with tempfile.TemporaryDirectory() as tmp:
+            claims_path = Path(tmp) / "claims.csv"
+            details_path = Path(tmp) / "details.csv"
+            claims_path.write_text(self._bad_rows_csv(5), encoding="utf-8")
+            details_path.write_text("id,claim_id,cpt_codes,denial_reason\n", encoding="utf-8")
+
+            with self.assertLogs("claims.management.commands.load_claim_data", "WARNING") as logs:
+                call_command("load_claim_data", str(claims_path), str(details_path))
+
+        self.assertIn(
+            "2 further row errors were logged but not kept in the summary.", logs.output[0]
+        )
+
+    def test_normalizes_and_validates_status(self):
+        """Tests that statuses are upper-cased and unknown values are rejected."""
+        claims_csv = (
+            "id,patient_name,billed_amount,paid_amount,status,insurer_name,discharge_date\n"
+            "1,Kiryu Kazuma,100.00,50.00,under review,CVS,2025-09-02\n"
+            "2,Majima Goro,100.00,50.00,PENDING,United,2025-09-03"
+        )
+        details_csv = "id,claim_id,cpt_codes,denial_reason\n"
+
+        summary, errors = self._run_ingestor_with_string_io(claims_csv, details_csv)
+
+        self.assertEqual(summary["claims_created"], 1)
+        self.assertEqual(Claim.objects.get(id=1).status, Claim.ClaimStatus.UNDER_REVIEW)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("Invalid status 'PENDING'", errors[0])
+
+class StatusMigrationTests(TransactionTestCase):
+    """
+    Tests for the data step that normalizes statuses before claim_status_valid is added.
+    """
+
+    before = [("claims", "0007_alter_claim_id_bigint")]
+    after = [("claims", "0008_claim_status_valid")]
+
+    def setUp(self):
+        self.executor = MigrationExecutor(connection)
+        self.leaf = self.executor.loader.graph.leaf_nodes("claims")
+        self.executor.migrate(self.before)
+        self.executor.loader.build_graph()
+        OldClaim = self.executor.loader.project_state(self.before).apps.get_model("claims", "Claim")
+        for claim_id, status in enumerate(("PAID", "under_review", "Denied ", "PENDING"), start=1):
+            OldClaim.objects.create(
+                id=claim_id, patient_name="P", billed_amount=Decimal("1.00"),
+                paid_amount=Decimal("0.00"), status=status, insurer_name="Ins",
+                discharge_date="2025-09-01",
+            )
+
+    def tearDown(self):
+        self.executor.loader.build_graph()
+        self.executor.migrate(self.leaf)
+
+    def test_known_spellings_are_normalized_and_unknown_statuses_stop_the_migration(self):
+        with self.assertRaisesMessage(RuntimeError, "unknown claim statuses 'PENDING' (1 claims)"):
+            self.executor.migrate(self.after)
+
+        self.executor.loader.build_graph()
+        OldClaim = self.executor.loader.project_state(self.before).apps.get_model("claims", "Claim")
+        OldClaim.objects.filter(status="PENDING").update(status="UNDER REVIEW")
+        self.executor.migrate(self.after)
+
+        statuses = dict(Claim.objects.values_list("id", "status"))
+        self.assertEqual(
+            statuses, {1: "PAID", 2: "UNDER REVIEW", 3: "DENIED", 4: "UNDER REVIEW"}
+        )
+
+
 class ClaimsModelsTests(TestCase):
     """
     Tests for the models in the claims app.
@@ -196,6 +511,106 @@ class ClaimsViewsTests(TestCase):
         self.assertContains(response, "John Doe")
         self.assertContains(response, "Jane Smith")
 
+    def test_claim_list_view_rows_do_not_load_deferred_fields(self):
+        url = reverse('claims:claim-list')
+        with CaptureQueriesContext(connection) as two_claims:
+            self.client.get(url)
+        for n in range(3, 8):
+            Claim.objects.create(
+                id=n, patient_name=f'Patient {n}', billed_amount=Decimal('10.00'),
+                paid_amount=Decimal('0.00'), status='PAID', insurer_name='Ins',
+                discharge_date='2025-09-03',
+            )
+        with CaptureQueriesContext(connection) as seven_claims:
+            self.client.get(url)
+
+        self.assertEqual(len(two_claims), len(seven_claims))
+
+    def test_infinite_scroll_pages_by_cursor_without_gaps_or_repeats(self):
+        Claim.objects.bulk_create(
+            Claim(
+                id=n, patient_name=f'Patient {n}', billed_amount=Decimal(n % 3),
+                paid_amount=Decimal('0.00'), status='PAID', insurer_name='Ins',
+                discharge_date='2025-09-03',
+            )
+            for n in range(3, 123)
+        )
+        response = self.client.get(reverse('claims:claim-list') + '?sort=-billed_amount')
+        seen = [claim.id for claim in response.context['claims']]
+        while next_url := response.context.get('next_rows_url'):
+            self.assertIn('after_id=', next_url)
+            self.assertNotIn('page=', next_url)
+            response = self.client.get(reverse('claims:claim-list') + next_url, HTTP_HX_REQUEST='true')
+            seen += [claim.id for claim in response.context['claims']]
+
+        self.assertEqual(len(seen), 122)
+        self.assertEqual(set(seen), set(range(1, 123)))
+
+    def test_claim_list_view_does_not_count_rows(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('claims:claim-list') + '?page=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any('COUNT(' in query['sql'] for query in queries))
+
+        self.assertEqual(self.client.get(reverse('claims:claim-list') + '?page=0').status_code, 404)
+
+    def test_name_sort_is_case_insensitive_across_scroll_pages(self):
+        Claim.objects.bulk_create(
+            Claim(
+                id=n, patient_name=('ann' if n % 2 else 'ANN') if n < 60 else 'bob',
+                billed_amount=Decimal('1.00'), paid_amount=Decimal('0.00'), status='PAID',
+                insurer_name='Ins', discharge_date='2025-09-03',
+            )
+            for n in range(3, 70)
+        )
+        response = self.client.get(reverse('claims:claim-list') + '?sort=patient_name')
+        names = [claim.patient_name for claim in response.context['claims']]
+        while next_url := response.context.get('next_rows_url'):
+            response = self.client.get(reverse('claims:claim-list') + next_url, HTTP_HX_REQUEST='true')
+            names += [claim.patient_name for claim in response.context['claims']]
+
+        lowered = [name.lower() for name in names]
+        self.assertEqual(lowered, sorted(lowered))
+        self.assertEqual(len(names), 69)
+
+    def _rows_query_sql(self, query_string):
+        """Returns the SQL of the claims query behind an infinite-scroll request."""
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(reverse('claims:claim-list') + query_string, HTTP_HX_REQUEST='true')
+        return next(q['sql'] for q in queries if 'FROM "claims_claim"' in q['sql'])
+
+    def test_infinite_scroll_cursor_bounds_the_sort_key(self):
+        # The tie-breaking OR alone cannot seek an index; the range bound ANDed in front can.
+        sql = self._rows_query_sql('?sort=-discharge_date&after=2025-09-02&after_id=2&_partial=rows')
+        self.assertIn('"discharge_date" <= ', sql)
+        sql = self._rows_query_sql('?sort=discharge_date&after=2025-09-01&after_id=1&_partial=rows')
+        self.assertIn('"discharge_date" >= ', sql)
+        sql = self._rows_query_sql('?sort=-patient_name&after=john doe&after_id=1&_partial=rows')
+        self.assertIn('LOWER("claims_claim"."patient_name") <= ', sql)
+
+    def test_infinite_scroll_rejects_malformed_cursor(self):
+        response = self.client.get(
+            reverse('claims:claim-list') + '?sort=discharge_date&after=not-a-date&after_id=1&_partial=rows',
+            HTTP_HX_REQUEST='true',
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_page_past_the_end_is_not_found(self):
+        self.assertEqual(self.client.get(reverse('claims:claim-list') + '?page=2').status_code, 404)
+        response = self.client.get(reverse('claims:claim-list') + '?search=nobody')
+        self.assertContains(response, 'No claims found matching your criteria.')
+
+    def test_oversized_page_is_not_found(self):
+        response = self.client.get(reverse('claims:claim-list') + '?page=1000000000000000000')
+        self.assertEqual(response.status_code, 404)
+
+    def test_claim_list_view_marks_claims_with_notes(self):
+        Note.objects.create(claim=self.claim2, note='Follow up', user=self.user)
+        response = self.client.get(reverse('claims:claim-list'))
+        flags = {claim.id: claim.has_notes for claim in response.context['claims']}
+        self.assertEqual(flags, {1: False, 2: True})
+        self.assertContains(response, 'class="notes-badge"', count=1)
+
     def test_claim_list_view_search(self):
         response = self.client.get(reverse('claims:claim-list') + '?search=Acme')
         self.assertEqual(response.status_code, 200)
@@ -208,6 +623,12 @@ class ClaimsViewsTests(TestCase):
         self.assertNotContains(response, "John Doe")
         self.assertContains(response, "Jane Smith")
 
+    def test_claim_list_view_unknown_status_skips_claims_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('claims:claim-list') + '?status=bogus')
+        self.assertContains(response, 'No claims found matching your criteria.')
+        self.assertFalse(any('claims_claim' in query['sql'] for query in queries))
+
     def test_claim_list_view_filter_by_flagged(self):
         response = self.client.get(reverse('claims:claim-list') + '?flagged=true')
         self.assertEqual(response.status_code, 200)
@@ -219,6 +640,19 @@ class ClaimsViewsTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertContains(response, "John Doe")
 
+    def test_claim_detail_view_note_queries_do_not_scale(self):
+        url = reverse('claims:claim-detail', args=[self.claim1.id])
+        Note.objects.create(claim=self.claim1, note='First', user=self.user)
+        with CaptureQueriesContext(connection) as one_note:
+            self.client.get(url)
+        for i in range(5):
+            Note.objects.create(claim=self.claim1, note=f'Note {i}', user=self.user)
+        with CaptureQueriesContext(connection) as many_notes:
+            response = self.client.get(url)
+
+        self.assertEqual(len(one_note), len(many_notes))
+        self.assertContains(response, 'testuser', count=6)
+
     def test_toggle_flag_view(self):
         self.assertFalse(self.claim1.is_flagged)
         response = self.client.post(reverse('claims:toggle-flag', args=[self.claim1.id]))
@@ -226,12 +660,117 @@ class ClaimsViewsTests(TestCase):
         self.claim1.refresh_from_db()
         self.assertTrue(self.claim1.is_flagged)
 
+    def test_toggle_flag_view_records_and_clears_audit_fields(self):
+        url = reverse('claims:toggle-flag', args=[self.claim1.id])
+        self.client.post(url)
+        self.claim1.refresh_from_db()
+        self.assertEqual(self.claim1.flagged_by, self.user)
+        self.assertIsNotNone(self.claim1.flagged_at)
+
+        response = self.client.post(url)
+        self.assertEqual(response['HX-Trigger'], f'refresh-claim-detail-{self.claim1.id}')
+        self.claim1.refresh_from_db()
+        self.assertFalse(self.claim1.is_flagged)
+        self.assertIsNone(self.claim1.flagged_by)
+        self.assertIsNone(self.claim1.flagged_at)
+
+        missing = self.client.post(reverse('claims:toggle-flag', args=[999]))
+        self.assertEqual(missing.status_code, 404)
+
     def test_add_note_view(self):
         self.assertEqual(self.claim1.notes.count(), 0)
         response = self.client.post(reverse('claims:add-note', args=[self.claim1.id]), {'note': 'This is a new note.'})
         self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'This is a new note.')
+        self.assertContains(response, 'testuser')
+        self.claim1.refresh_from_db()
+        self.assertEqual(self.claim1.last_note_at, self.claim1.notes.get().created_at)
         self.assertEqual(self.claim1.notes.count(), 1)
+
+    def test_add_note_view_saves_several_notes_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('claims:add-note', args=[self.claim1.id]),
+                {'note': ['First line\n\nstill the first note', ' ', 'Second note']},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(self.claim1.notes.values_list('note', flat=True)),
+            ['First line\n\nstill the first note', 'Second note'],
+        )
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "claims_note"')]
+        self.assertEqual(len(inserts), 1)
+
+    def test_add_note_view_ignores_blank_note(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('claims:add-note', args=[self.claim1.id]), {'note': '   '})
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(any('claims_' in query['sql'] for query in queries))
+        self.assertEqual(self.claim1.notes.count(), 0)
+
+    def test_add_note_view_missing_claim(self):
+        response = self.client.post(reverse('claims:add-note', args=[999]), {'note': 'Orphan'})
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(Note.objects.exists())
         
+class NoteAdminTests(TestCase):
+    """
+    Tests for adding notes through the Django admin.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_superuser(username='admin', password='password')
+        self.client.login(username='admin', password='password')
+        self.claim = Claim.objects.create(
+            id=1, patient_name='John Doe', billed_amount=Decimal('1000.00'),
+            paid_amount=Decimal('800.00'), status='PAID', insurer_name='Acme Insurance',
+            discharge_date='2025-09-01',
+        )
+
+    def _add_note(self, created_at):
+        # The admin form takes the date and time in the project's time zone.
+        created_at = timezone.localtime(created_at)
+        return self.client.post(reverse('admin:claims_note_add'), {
+            'claim': self.claim.id,
+            'note': 'Entered from the admin.',
+            'created_at_0': created_at.date().isoformat(),
+            'created_at_1': created_at.time().strftime('%H:%M:%S'),
+            'user': self.user.id,
+        })
+
+    def test_admin_note_advances_but_never_rewinds_last_note_at(self):
+        latest = timezone.now().replace(microsecond=0)
+        self.assertEqual(self._add_note(latest).status_code, 302)
+        self.claim.refresh_from_db()
+        self.assertEqual(self.claim.last_note_at, latest)
+
+        self.assertEqual(self._add_note(latest - timedelta(days=30)).status_code, 302)
+        self.claim.refresh_from_db()
+        self.assertEqual(self.claim.notes.count(), 2)
+        self.assertEqual(self.claim.last_note_at, latest)
+
+
+class ClaimTagsTests(SimpleTestCase):
+    """
+    Tests for the sorting template tags.
+    """
+
+    def test_sort_url_preserves_filters_and_toggles_direction(self):
+        request = RequestFactory().get("/", {"search": "acme", "sort": "billed_amount", "status": "PAID"})
+        context = {"request": request}
+
+        self.assertEqual(sort_url(context, "billed_amount"), "?search=acme&status=PAID&sort=-billed_amount")
+        self.assertEqual(sort_url(context, "patient_name"), "?search=acme&status=PAID&sort=patient_name")
+
+    def test_sort_url_defaults_to_ascending_id(self):
+        """With no sort parameter the list is sorted by id, so the id header offers descending."""
+        request = RequestFactory().get("/")
+        self.assertEqual(sort_url({"request": request}, "id"), "?sort=-id")
+
+    def test_sort_url_without_other_params(self):
+        request = RequestFactory().get("/", {"sort": "-id"})
+        self.assertEqual(sort_url({"request": request}, "id"), "?sort=id")
+
 class RegistrationFlowTests(TestCase):
     def test_register_with_weak_password_and_login(self):
         # GET register page
@@ -1,10 +1,13 @@
 import logging
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional, Tuple
 
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Q, QuerySet
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import get_object_or_404, render
+from django.core.exceptions import BadRequest, ValidationError
+from django.db.models import Case, Exists, F, OuterRef, Prefetch, Q, QuerySet, Value, When
+from django.db.models.functions import Lower
+from django.http import Http404, HttpRequest, HttpResponse
+from django.shortcuts import get_object_or_404
+from django.template.loader import get_template
 from django.utils import timezone
 from django.views.generic import DetailView, ListView, View, FormView
 from django.urls import reverse_lazy
@@ -15,6 +18,32 @@ from .models import Claim, Note
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; TextChoices.choices constructs a new list on every access.
+_STATUS_CHOICES = tuple(Claim.ClaimStatus.choices)
+_VALID_STATUSES = frozenset(Claim.ClaimStatus.values)
+# Columns the dashboard can sort by, mapped to the expression each orders on. Names
+# sort case-insensitively; functional indexes on Lower(...) keep those sorts indexed.
+_SORT_EXPRS = {
+    "id": F("id"),
+    "patient_name": Lower("patient_name"),
+    "billed_amount": F("billed_amount"),
+    "paid_amount": F("paid_amount"),
+    "status": F("status"),
+    "insurer_name": Lower("insurer_name"),
+    "discharge_date": F("discharge_date"),
+}
+# HTMX event the claim detail row and list-row flag button listen for.
+_REFRESH_CLAIM_EVENT = "refresh-claim-detail-{}".format
+
+
+def _render_partial(template_name: str, context: Dict[str, Any]) -> HttpResponse:
+    """
+    Renders a small HTMX partial that needs nothing from the request. Leaving the
+    request out skips the context processors (request, auth, messages) render()
+    runs for every response; the compiled template comes from Django's cached loader.
+    """
+    return HttpResponse(get_template(template_name).render(context))
+
 
 class ClaimListView(LoginRequiredMixin, ListView):
     """
@@ -31,6 +60,18 @@ class ClaimListView(LoginRequiredMixin, ListView):
     template_name = "claims/claim_list.html"
     context_object_name = "claims"
     paginate_by = 50
+    has_next_rows = False
+    # The only columns the table rows render; everything else stays in the database.
+    list_fields = (
+        "id",
+        "patient_name",
+        "billed_amount",
+        "paid_amount",
+        "status",
+        "insurer_name",
+        "discharge_date",
+        "is_flagged",
+    )
 
     def _apply_search_filter(self, queryset: QuerySet, search_query: str) -> QuerySet:
         """Applies a search filter to the queryset based on patient or insurer name."""
@@ -43,9 +84,13 @@ class ClaimListView(LoginRequiredMixin, ListView):
 
     def _apply_status_filter(self, queryset: QuerySet, status_filter: str) -> QuerySet:
         """Applies a filter for a specific claim status."""
-        if status_filter:
-            return queryset.filter(status=status_filter.upper())
-        return queryset
+        if not status_filter:
+            return queryset
+        status = status_filter.upper()
+        if status not in _VALID_STATUSES:
+            # No claim can match; none() answers without querying the database.
+            return queryset.none()
+        return queryset.filter(status=status)
 
     def _apply_flagged_filter(
         self, queryset: QuerySet, flagged_filter: str
@@ -56,39 +101,83 @@ class ClaimListView(LoginRequiredMixin, ListView):
         return queryset
 
     def _apply_sorting(self, queryset: QuerySet, sort_by: str) -> QuerySet:
-        """Applies sorting to the queryset based on the provided field."""
-        allowed_sort_fields = [
-            "id",
-            "patient_name",
-            "billed_amount",
-            "paid_amount",
-            "status",
-            "insurer_name",
-            "discharge_date",
-        ]
+        """
+        Applies sorting to the queryset based on the provided field. The sort
+        expression is annotated as `sort_key` so the scroll cursor can compare
+        against exactly the value the rows are ordered by.
+        """
         # Fallback to a default sort order if the requested field is not allowed.
         sort_field = sort_by.lstrip("-")
-        if sort_field not in allowed_sort_fields:
+        if sort_field not in _SORT_EXPRS:
             sort_by = "-discharge_date"
-        return queryset.order_by(sort_by)
+            sort_field = "discharge_date"
+        self.sort_by = sort_by
+        if sort_field == "id":
+            return queryset.order_by(sort_by)
+        descending = sort_by.startswith("-")
+        # The id tie-breaker gives every row a unique position, which keyset paging relies on.
+        return queryset.annotate(sort_key=_SORT_EXPRS[sort_field]).order_by(
+            "-sort_key" if descending else "sort_key", "-id" if descending else "id"
+        )
+
+    def _apply_cursor(
+        self, queryset: QuerySet, after: Optional[str], after_id: Optional[str]
+    ) -> QuerySet:
+        """
+        Continues an infinite-scroll listing after the last row already shown,
+        identified by its sort key and id. An OFFSET would read and discard every
+        earlier row; the inclusive range bound on the sort key instead lets the
+        sort index seek straight to the cursor, since the OR that breaks ties on
+        id cannot drive an index scan by itself.
+        """
+        if after_id is None:
+            return queryset
+        sort_field = self.sort_by.lstrip("-")
+        descending = self.sort_by.startswith("-")
+        op = "lt" if descending else "gt"
+        try:
+            last_id = int(after_id)
+            last_value = Claim._meta.get_field(sort_field).to_python(after)
+        except (ValueError, ValidationError):
+            raise BadRequest("Invalid scroll cursor.")
+        if sort_field == "id":
+            return queryset.filter(**{f"id__{op}": last_id})
+        if last_value is None:
+            raise BadRequest("Invalid scroll cursor.")
+        return queryset.filter(
+            Q(**{f"sort_key__{'lte' if descending else 'gte'}": last_value}),
+            Q(**{f"sort_key__{op}": last_value})
+            | Q(sort_key=last_value, **{f"id__{op}": last_id}),
+        )
 
     def get_queryset(self) -> QuerySet[Claim]:
         """
         Overrides the default queryset to implement search, filter, and sorting logic.
         """
-        queryset = super().get_queryset().select_related("details")
+        queryset = (
+            super()
+            .get_queryset()
+            .only(*self.list_fields)
+            # A correlated EXISTS in the same query: no Note rows are fetched for the badge.
+            .annotate(has_notes=Exists(Note.objects.filter(claim=OuterRef("pk"))))
+        )
 
         # Get search/filter parameters from the request URL.
-        search_query = self.request.GET.get("search", "")
-        status_filter = self.request.GET.get("status", "")
-        flagged_filter = self.request.GET.get("flagged", "")
-        sort_by = self.request.GET.get("sort", "id")  # Default sort.
+        params = self.request.GET
+        search_query = params.get("search", "")
+        status_filter = params.get("status", "")
+        flagged_filter = params.get("flagged", "")
+        sort_by = params.get("sort", "id")  # Default sort.
 
         # Chain the filtering and sorting methods.
         queryset = self._apply_search_filter(queryset, search_query)
         queryset = self._apply_status_filter(queryset, status_filter)
         queryset = self._apply_flagged_filter(queryset, flagged_filter)
         queryset = self._apply_sorting(queryset, sort_by)
+        if self._is_rows_request():
+            queryset = self._apply_cursor(
+                queryset, params.get("after"), params.get("after_id")
+            )
 
         return queryset
 
@@ -102,28 +191,79 @@ class ClaimListView(LoginRequiredMixin, ListView):
         context["request"] = self.request
 
         # Provide current filter values to the template to repopulate controls.
-        context["claim_statuses"] = Claim.ClaimStatus.choices
-        context["current_search"] = self.request.GET.get("search", "")
-        context["current_status"] = self.request.GET.get("status", "")
-        context["current_flagged"] = self.request.GET.get("flagged", "")
-
-        # Provide current sort values to the template.
-        sort_param = self.request.GET.get("sort", "-discharge_date")
+        params = self.request.GET
+        context["claim_statuses"] = _STATUS_CHOICES
+        context["current_search"] = params.get("search", "")
+        context["current_status"] = params.get("status", "")
+        context["current_flagged"] = params.get("flagged", "")
+
+        # Provide the sort get_queryset() actually applied, after defaulting and validation.
+        sort_param = self.sort_by
         context["current_sort_param"] = sort_param
         context["current_sort_field"] = sort_param.lstrip("-")
         context["current_sort_dir"] = "desc" if sort_param.startswith("-") else "asc"
 
+        # Infinite scroll: the sentinel row asks for the rows after the last one rendered.
+        claims = context["object_list"]
+        if self.has_next_rows and claims:
+            context["next_rows_url"] = self._next_rows_url(claims[-1])
+
         return context
 
+    def _is_rows_request(self) -> bool:
+        """True for the HTMX infinite-scroll requests that only need the next rows."""
+        return bool(self.request.htmx) and self.request.GET.get("_partial") == "rows"
+
+    def paginate_queryset(
+        self, queryset: QuerySet, page_size: int
+    ) -> Tuple[Any, Any, List[Claim], bool]:
+        """
+        Takes one page of claims, fetching one extra row to learn whether more
+        remain. Django's Paginator is bypassed because it runs a COUNT(*) over the
+        whole filtered set to number pages, and no template shows a page count.
+        Infinite-scroll requests are already positioned by their cursor; otherwise
+        the optional `page` parameter selects an offset page, and a page past the
+        end is a 404 as it was with Paginator.
+        """
+        start = 0
+        page_number = 1
+        if not self._is_rows_request():
+            try:
+                page_number = int(self.request.GET.get("page") or 1)
+            except ValueError:
+                raise Http404("Invalid page.")
+            start = (page_number - 1) * page_size
+            # Databases take OFFSET/LIMIT as 64-bit integers; no real page lies beyond that.
+            if page_number < 1 or start + page_size >= 2**63:
+                raise Http404("Invalid page.")
+
+        rows = list(queryset[start : start + page_size + 1])
+        if page_number > 1 and not rows:
+            raise Http404("Invalid page.")
+        self.has_next_rows = len(rows) > page_size
+        return None, None, rows[:page_size], False
+
+    def _next_rows_url(self, last_claim: Claim) -> str:
+        """Builds the query string that loads the rows following `last_claim`."""
+        params = self.request.GET.copy()
+        params.pop("page", None)
+        params["sort"] = self.sort_by
+        params["after"] = str(
+            last_claim.id if self.sort_by.lstrip("-") == "id" else last_claim.sort_key
+        )
+        params["after_id"] = str(last_claim.id)
+        params["_partial"] = "rows"
+        return f"?{params.urlencode()}"
+
     def get_template_names(self) -> list[str]:
         """
         If the request is from HTMX, return the appropriate partial template.
         - For infinite scroll, return just the table rows.
         - For sorting/filtering, return the entire table body.
         """
+        if self._is_rows_request():
+            return ["claims/partials/_claim_rows.html"]
         if self.request.htmx:
-            if self.request.GET.get("_partial") == "rows":
-                return ["claims/partials/_claim_rows.html"]
             return ["claims/partials/_claims_table.html"]
         return [self.template_name]
 
@@ -140,10 +280,23 @@ class ClaimDetailView(LoginRequiredMixin, DetailView):
     context_object_name = "claim"
     pk_url_kwarg = "claim_id"
 
+    def get_queryset(self) -> QuerySet[Claim]:
+        """
+        Fetches the claim with its details, then its notes and their authors in a
+        single prefetch query, so rendering the notes costs no query per note.
+        """
+        return Claim.objects.select_related("details").prefetch_related(
+            Prefetch(
+                "notes",
+                queryset=Note.objects.select_related("user").order_by("-created_at"),
+                to_attr="ordered_notes",
+            )
+        )
+
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         """Adds the claim's notes to the context, ordered by most recent first."""
         context = super().get_context_data(**kwargs)
-        context["notes"] = self.object.notes.all().order_by("-created_at")
+        context["notes"] = self.object.ordered_notes
         return context
 
 
@@ -155,17 +308,17 @@ class ToggleFlagView(LoginRequiredMixin, View):
     """
 
     def post(self, request: HttpRequest, claim_id: int) -> HttpResponse:
-        claim = get_object_or_404(Claim, id=claim_id)
-        claim.is_flagged = not claim.is_flagged
-
-        if claim.is_flagged:
-            claim.flagged_by = request.user
-            claim.flagged_at = timezone.now()
-        else:
-            claim.flagged_by = None
-            claim.flagged_at = None
-
-        claim.save(update_fields=["is_flagged", "flagged_by", "flagged_at"])
+        # Flip the flag in one UPDATE so concurrent toggles cannot both read the same
+        # old value. Every SET expression sees the row as it was before the update.
+        now_flagged = Q(is_flagged=False)
+        updated = Claim.objects.filter(id=claim_id).update(
+            is_flagged=~F("is_flagged"),
+            flagged_by=Case(When(now_flagged, then=Value(request.user.id)), default=None),
+            flagged_at=Case(When(now_flagged, then=Value(timezone.now())), default=None),
+        )
+        if not updated:
+            raise Http404("No Claim matches the given query.")
+        claim = Claim.objects.only("id", "is_flagged").get(id=claim_id)
 
         logger.info(
             f"User '{request.user.username}' (ID: {request.user.id}) "
@@ -173,37 +326,51 @@ class ToggleFlagView(LoginRequiredMixin, View):
         )
 
         # Render the button's HTML partial in response to the POST request.
-        response = render(
-            request, "claims/partials/_flag_button.html", {"claim": claim}
-        )
+        response = _render_partial("claims/partials/_flag_button.html", {"claim": claim})
 
         # Add a special HTMX header to broadcast an event with the claim's ID.
         # This allows other components on the page to react to the change.
-        response["HX-Trigger"] = f"refresh-claim-detail-{claim_id}"
+        response["HX-Trigger"] = _REFRESH_CLAIM_EVENT(claim_id)
 
         return response
 
 
 class AddNoteView(LoginRequiredMixin, View):
     """
-    Handles POST requests to add a new note to a claim.
+    Handles POST requests to add one or more notes to a claim.
     Returns an HTML partial of the updated notes section.
     """
 
     def post(self, request: HttpRequest, claim_id: int) -> HttpResponse:
-        claim = get_object_or_404(Claim, id=claim_id)
-        note_text = request.POST.get("note", "").strip()
-
-        if note_text:
-            note = Note.objects.create(claim=claim, note=note_text, user=request.user)
-            logger.info(
-                f"User '{request.user.username}' (ID: {request.user.id}) "
-                f"added Note ID {note.id} to Claim ID {claim_id}."
-            )
+        # A form may submit several `note` fields; each non-blank one becomes a note.
+        note_texts = [text for text in map(str.strip, request.POST.getlist("note")) if text]
+        # Nothing to save: 204 tells HTMX to leave the notes section as it is.
+        if not note_texts:
+            return HttpResponse(status=204)
+
+        if not Claim.objects.filter(id=claim_id).exists():
+            raise Http404("No Claim matches the given query.")
+        # One multi-row INSERT however many notes were submitted.
+        notes = Note.objects.bulk_create(
+            [Note(claim_id=claim_id, note=text, user=request.user) for text in note_texts]
+        )
+        latest = max(note.created_at for note in notes)
+        # Only move forward, so a slower concurrent post cannot replace a newer value.
+        Claim.objects.filter(
+            Q(id=claim_id), Q(last_note_at__isnull=True) | Q(last_note_at__lt=latest)
+        ).update(last_note_at=latest)
+        logger.info(
+            f"User '{request.user.username}' (ID: {request.user.id}) "
+            f"added {len(notes)} note(s) to Claim ID {claim_id}."
+        )
 
         # Return the updated notes list, ordered by most recent first.
-        notes = claim.notes.all().order_by("-created_at")
-        return render(request, "claims/partials/_notes_section.html", {"notes": notes})
+        notes = (
+            Note.objects.filter(claim_id=claim_id)
+            .select_related("user")
+            .order_by("-created_at")
+        )
+        return _render_partial("claims/partials/_notes_section.html", {"notes": notes})
 
 
 class FlagButtonView(LoginRequiredMixin, View):
@@ -214,7 +381,7 @@ class FlagButtonView(LoginRequiredMixin, View):
 
     def get(self, request: HttpRequest, claim_id: int) -> HttpResponse:
         claim = get_object_or_404(Claim, id=claim_id)
-        return render(request, "claims/partials/_flag_button.html", {"claim": claim})
+        return _render_partial("claims/partials/_flag_button.html", {"claim": claim})
 
 
 class RegisterView(FormView):